@@ -3,13 +3,199 @@ Indexing pipeline for document processing and vector storage
 """
 
 import os
+import asyncio
+import threading
+import xxhash
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
 from pathlib import Path
-from langchain_community.document_loaders import PyPDFLoader, TextLoader, UnstructuredMarkdownLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain_community.document_loaders import PyMuPDFLoader, TextLoader
+from langchain_core.documents import Document
+from langchain.text_splitter import MarkdownHeaderTextSplitter, RecursiveCharacterTextSplitter
 from langchain_community.embeddings import OllamaEmbeddings
-from langchain_community.vectorstores import Qdrant
-from qdrant_client import QdrantClient
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.models import (
+    Distance,
+    HnswConfigDiff,
+    PayloadSchemaType,
+    PointStruct,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    VectorParams
+)
+
+# Shared splitter configuration, specialized per file type so the recursive
+# splitter finds a fitting boundary early instead of descending separator by
+# separator. Plain len() is the right length function here — str length is
+# O(1) in CPython, so measuring by characters costs nothing.
+SPLITTER_SEPARATORS = ["\n\n", "\n", " ", ""]
+PDF_SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+MARKDOWN_SEPARATORS = ["\n## ", "\n### ", "\n\n", "\n", " ", ""]
+
+# Markdown headers preserved as chunk metadata by the header splitter
+MARKDOWN_HEADERS = [("#", "header_1"), ("##", "header_2"), ("###", "header_3")]
+
+
+def _split_documents(documents: List, chunk_size: int, chunk_overlap: int) -> List:
+    """
+    Split documents into chunks with a splitter matched to the file type
+
+    Markdown documents are first sectioned on headers (keeping the header
+    trail in metadata), then size-limited with markdown-aware separators;
+    PDFs fall back to sentence boundaries before single spaces; everything
+    else uses the generic separators.
+
+    Args:
+        documents: List of documents to split
+        chunk_size: Size of text chunks for splitting
+        chunk_overlap: Overlap between chunks
+
+    Returns:
+        List of document chunks
+    """
+    def make_splitter(separators):
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            separators=separators
+        )
+
+    markdown_docs, pdf_docs, other_docs = [], [], []
+    for document in documents:
+        extension = Path(document.metadata.get("source", "")).suffix.lower()
+        if extension in ('.md', '.markdown'):
+            markdown_docs.append(document)
+        elif extension == '.pdf':
+            pdf_docs.append(document)
+        else:
+            other_docs.append(document)
+
+    chunks = []
+
+    if markdown_docs:
+        header_splitter = MarkdownHeaderTextSplitter(
+            headers_to_split_on=MARKDOWN_HEADERS,
+            strip_headers=False
+        )
+        sections = []
+        for document in markdown_docs:
+            for section in header_splitter.split_text(document.page_content):
+                section.metadata = {**document.metadata, **section.metadata}
+                sections.append(section)
+        chunks.extend(make_splitter(MARKDOWN_SEPARATORS).split_documents(sections))
+
+    if pdf_docs:
+        chunks.extend(make_splitter(PDF_SEPARATORS).split_documents(pdf_docs))
+
+    if other_docs:
+        chunks.extend(make_splitter(SPLITTER_SEPARATORS).split_documents(other_docs))
+
+    return chunks
+
+# File extensions the indexer knows how to load
+SUPPORTED_EXTENSIONS = frozenset({'.pdf', '.txt', '.text', '.md', '.markdown'})
+
+
+def _load_document(file_path: str) -> List:
+    """
+    Load a document based on its file type
+
+    Module-level so it can run in process pool workers.
+
+    Args:
+        file_path: Path to the document
+
+    Returns:
+        List of loaded documents
+    """
+    file_extension = Path(file_path).suffix.lower()
+
+    if file_extension == '.pdf':
+        # MuPDF (C library) extracts text several times faster than pypdf
+        loader = PyMuPDFLoader(file_path)
+    elif file_extension in ['.txt', '.text', '.md', '.markdown']:
+        # Markdown is loaded raw (like the in-memory upload path) so the
+        # header markers survive for the header-aware splitter —
+        # unstructured strips them during parsing
+        loader = TextLoader(file_path)
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+    return loader.load()
+
+
+def _load_document_bytes(data: bytes, filename: str) -> List:
+    """
+    Load a document from in-memory bytes
+
+    Avoids the temp-file write/read round trip for uploads that are already
+    in RAM: PDFs go through PyMuPDF's stream API, text and Markdown are
+    decoded directly.
+
+    Args:
+        data: Raw file contents
+        filename: Original filename (used for type dispatch and metadata)
+
+    Returns:
+        List of loaded documents
+    """
+    file_extension = Path(filename).suffix.lower()
+
+    if file_extension == '.pdf':
+        import pymupdf
+        with pymupdf.open(stream=data, filetype="pdf") as pdf:
+            return [
+                Document(
+                    page_content=page.get_text(),
+                    metadata={"source": filename, "page": page.number, "total_pages": pdf.page_count}
+                )
+                for page in pdf
+            ]
+
+    if file_extension in ['.txt', '.text', '.md', '.markdown']:
+        return [Document(page_content=data.decode("utf-8", errors="replace"),
+                         metadata={"source": filename})]
+
+    raise ValueError(f"Unsupported file type: {file_extension}")
+
+
+def _load_and_split(file_path: str, chunk_size: int, chunk_overlap: int) -> List:
+    """
+    Load one file and split it into chunks (process pool worker)
+
+    Builds its own splitter from plain config values so the task pickles
+    cleanly into worker processes.
+
+    Args:
+        file_path: Path to the document
+        chunk_size: Size of text chunks for splitting
+        chunk_overlap: Overlap between chunks
+
+    Returns:
+        List of document chunks
+    """
+    return _split_documents(_load_document(file_path), chunk_size, chunk_overlap)
+
+
+def _iter_supported_files(root: str):
+    """
+    Yield paths of all supported files under root
+
+    Walks the tree with os.scandir, which reuses the directory entry's
+    cached file type instead of stat-ing every path the way
+    Path.rglob('*') + is_file() does.
+    """
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_supported_files(entry.path)
+            elif entry.is_file():
+                extension = os.path.splitext(entry.name)[1].lower()
+                if extension in SUPPORTED_EXTENSIONS:
+                    yield entry.path
+
 
 class DocumentIndexer:
     """Handles document loading, processing, and indexing into vector database"""
@@ -20,39 +206,61 @@ class DocumentIndexer:
         qdrant_url: str = "http://localhost:6333",
         embedding_model: str = "nomic-embed-text",
         chunk_size: int = 1000,
-        chunk_overlap: int = 200
+        chunk_overlap: int = 200,
+        use_fastembed: bool = False,
+        fastembed_model: str = "nomic-ai/nomic-embed-text-v1.5"
     ):
         """
         Initialize the document indexer
-        
+
         Args:
             ollama_url: URL for Ollama service
             qdrant_url: URL for Qdrant vector database
             embedding_model: Name of the embedding model to use
             chunk_size: Size of text chunks for splitting
             chunk_overlap: Overlap between chunks
+            use_fastembed: Embed in-process with FastEmbed (ONNX) instead of
+                going over HTTP to Ollama (requires the optional fastembed
+                package)
+            fastembed_model: FastEmbed model name (only used with use_fastembed)
         """
         self.ollama_url = ollama_url
         self.qdrant_url = qdrant_url
         self.embedding_model = embedding_model
-        
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
         # Initialize embeddings
         self.embeddings = OllamaEmbeddings(
             base_url=ollama_url,
             model=embedding_model,
             model_kwargs={}  # Use only default supported parameters
         )
+
+        # Optional in-process embedding backend (no HTTP round trip)
+        self._fastembed = None
+        if use_fastembed:
+            from fastembed import TextEmbedding
+            self._fastembed = TextEmbedding(model_name=fastembed_model, threads=os.cpu_count())
+        else:
+            # Warm up the embedding model so the first real request doesn't
+            # pay the cold-load stall. Runs in a daemon thread: Ollama may
+            # still be starting (or pulling the model), and startup must not
+            # block on it — failures are non-fatal
+            def warm_up():
+                try:
+                    self.embeddings.embed_query(" ")
+                except Exception:
+                    pass
+
+            threading.Thread(target=warm_up, daemon=True).start()
         
-        # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=["\n\n", "\n", " ", ""]
-        )
-        
-        # Initialize Qdrant client
-        self.qdrant_client = QdrantClient(url=qdrant_url)
+        # Initialize Qdrant client (gRPC avoids JSON serialization of
+        # vectors on every batch upsert)
+        self.qdrant_client = QdrantClient(url=qdrant_url, prefer_grpc=True, grpc_port=6334)
+
+        # Collections we have already created/verified this process
+        self._known_collections = set()
     
     def load_document(self, file_path: str) -> List:
         """
@@ -64,35 +272,124 @@ class DocumentIndexer:
         Returns:
             List of loaded documents
         """
-        file_extension = Path(file_path).suffix.lower()
-        
-        if file_extension == '.pdf':
-            loader = PyPDFLoader(file_path)
-        elif file_extension in ['.txt', '.text']:
-            loader = TextLoader(file_path)
-        elif file_extension in ['.md', '.markdown']:
-            loader = UnstructuredMarkdownLoader(file_path)
-        else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
-        
-        return loader.load()
+        return _load_document(file_path)
     
     def process_documents(self, documents: List) -> List:
         """
         Split documents into chunks
-        
+
+        Picks a splitter configuration matched to each document's file type
+        (markdown header-aware, PDF sentence-aware, generic otherwise).
+
         Args:
             documents: List of documents to process
-            
+
         Returns:
             List of document chunks
         """
-        return self.text_splitter.split_documents(documents)
+        return _split_documents(documents, self.chunk_size, self.chunk_overlap)
     
+    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a batch of texts with the configured backend
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embedding vectors
+        """
+        if self._fastembed is not None:
+            return [vector.tolist() for vector in self._fastembed.embed(texts, batch_size=64)]
+        return self.embeddings.embed_documents(texts)
+
+    def _dedupe_chunks(self, chunks: List, collection_name: str):
+        """
+        Drop chunks whose content is already indexed
+
+        Point IDs are a deterministic xxh64 hash of (topic, content), so
+        re-indexing identical chunks into the same topic is detected with a
+        single retrieve call and skipped before the expensive embedding step.
+
+        Args:
+            chunks: Candidate document chunks
+            collection_name: Name of the Qdrant collection
+
+        Returns:
+            Tuple of (chunks, point_ids) with duplicates removed
+        """
+        unique = {}
+        for chunk in chunks:
+            point_id = xxhash.xxh64_intdigest(
+                f"{chunk.metadata.get('topic', '')}\x00{chunk.page_content}".encode("utf-8")
+            )
+            unique.setdefault(point_id, chunk)
+
+        if unique and (collection_name in self._known_collections
+                       or self.qdrant_client.collection_exists(collection_name)):
+            existing = self.qdrant_client.retrieve(
+                collection_name=collection_name,
+                ids=list(unique),
+                with_payload=False,
+                with_vectors=False
+            )
+            for point in existing:
+                unique.pop(point.id, None)
+
+        return list(unique.values()), list(unique)
+
+    def _ensure_collection(self, collection_name: str, vector_size: int) -> None:
+        """
+        Create the collection if it doesn't exist yet
+
+        The result is cached per process so repeated indexing calls skip
+        the existence probe against Qdrant. On first use the cache is seeded
+        with all existing collections in a single round trip.
+
+        Args:
+            collection_name: Name of the Qdrant collection
+            vector_size: Dimensionality of the embedding vectors
+        """
+        if collection_name in self._known_collections:
+            return
+
+        if not self._known_collections:
+            self._known_collections.update(self.list_collections())
+            if collection_name in self._known_collections:
+                return
+
+        if not self.qdrant_client.collection_exists(collection_name):
+            # Store full-precision vectors and the HNSW graph on disk; keep
+            # INT8-quantized vectors in RAM for search (4x smaller, <1%
+            # recall loss on these embedding models)
+            self.qdrant_client.create_collection(
+                collection_name=collection_name,
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=True),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+                ),
+                hnsw_config=HnswConfigDiff(on_disk=True)
+            )
+
+            # Keyword indexes let topic/file filters and facet aggregations
+            # run server-side instead of scanning payloads
+            for field_name in ("metadata.topic", "metadata.source_file"):
+                self.qdrant_client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=PayloadSchemaType.KEYWORD
+                )
+
+        self._known_collections.add(collection_name)
+
     def index_documents(self, chunks: List, collection_name: str, metadata: dict = None) -> None:
         """
         Index document chunks into Qdrant
-        
+
+        Embeds all chunks in a single batched call and uploads them with
+        qdrant-client's batched uploader instead of going through the
+        LangChain vector store wrapper chunk-by-chunk.
+
         Args:
             chunks: List of document chunks
             collection_name: Name of the Qdrant collection
@@ -102,14 +399,39 @@ class DocumentIndexer:
         if metadata:
             for chunk in chunks:
                 chunk.metadata.update(metadata)
-        
-        # Create or update vector store
-        Qdrant.from_documents(
-            documents=chunks,
-            embedding=self.embeddings,
-            url=self.qdrant_url,
+
+        if not chunks:
+            return
+
+        # Skip chunks whose content is already in the collection
+        chunks, ids = self._dedupe_chunks(chunks, collection_name)
+        if not chunks:
+            return
+
+        # Embed all chunks in one batched call
+        vectors = self._embed_texts([chunk.page_content for chunk in chunks])
+
+        self._ensure_collection(collection_name, len(vectors[0]))
+
+        # Payload layout matches the LangChain Qdrant wrapper so retrieval
+        # keeps reading 'page_content' and 'metadata' as before
+        payloads = [
+            {"page_content": chunk.page_content, "metadata": chunk.metadata}
+            for chunk in chunks
+        ]
+
+        # Parallel worker processes only pay off for bulk loads; a typical
+        # single-file upload fits one batch and should not fork workers
+        parallel = max(1, (os.cpu_count() or 2) // 2) if len(chunks) >= 256 else 1
+
+        self.qdrant_client.upload_collection(
             collection_name=collection_name,
-            force_recreate=False
+            vectors=vectors,
+            payload=payloads,
+            ids=ids,
+            batch_size=32,
+            parallel=parallel,
+            wait=False
         )
     
     def index_file(self, file_path: str, collection_name: str, topic: str, metadata: dict = None) -> dict:
@@ -150,10 +472,53 @@ class DocumentIndexer:
             "status": "success"
         }
     
+    def index_bytes(self, data: bytes, filename: str, collection_name: str, topic: str, metadata: dict = None) -> dict:
+        """
+        Index a document straight from in-memory bytes
+
+        Same pipeline as index_file but without a file on disk — uploads
+        are processed from the request body directly.
+
+        Args:
+            data: Raw file contents
+            filename: Original filename
+            collection_name: Name of the Qdrant collection
+            topic: Topic/category for this document
+            metadata: Additional metadata
+
+        Returns:
+            Dictionary with indexing statistics
+        """
+        # Load document from memory
+        documents = _load_document_bytes(data, filename)
+
+        # Process into chunks
+        chunks = self.process_documents(documents)
+
+        # Add file metadata including topic
+        file_metadata = {
+            "source_file": filename,
+            "topic": topic,
+            **(metadata or {})
+        }
+
+        # Index chunks
+        self.index_documents(chunks, collection_name, file_metadata)
+
+        return {
+            "file": filename,
+            "num_chunks": len(chunks),
+            "collection": collection_name,
+            "topic": topic,
+            "status": "success"
+        }
+
     def index_directory(self, directory_path: str, collection_name: str, topic: str, metadata: dict = None) -> List[dict]:
         """
         Index all supported files in a directory
-        
+
+        Synchronous wrapper around aindex_directory.
+
         Args:
             directory_path: Path to the directory
             collection_name: Name of the Qdrant collection
@@ -163,24 +528,139 @@ class DocumentIndexer:
         Returns:
             List of indexing results for each file
         """
-        results = []
-        directory = Path(directory_path)
-        
-        # Supported file extensions
-        supported_extensions = ['.pdf', '.txt', '.text', '.md', '.markdown']
-        
-        for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
+        return asyncio.run(self.aindex_directory(directory_path, collection_name, topic, metadata))
+
+    async def aindex_directory(
+        self,
+        directory_path: str,
+        collection_name: str,
+        topic: str,
+        metadata: dict = None,
+        max_concurrency: int = 8,
+        embed_batch_size: int = 64
+    ) -> List[dict]:
+        """
+        Asynchronously index all supported files in a directory
+
+        Runs in three phases: (1) load and split every file concurrently,
+        (2) embed all chunks across all files in fixed-size batches so the
+        embedding service sees full batches regardless of file size, and
+        (3) bulk-upload the embedded points. Concurrency in each phase is
+        bounded by max_concurrency.
+
+        Args:
+            directory_path: Path to the directory
+            collection_name: Name of the Qdrant collection
+            topic: Topic/category for these documents
+            metadata: Additional metadata
+            max_concurrency: Maximum number of concurrent file/batch tasks
+            embed_batch_size: Number of chunks per embedding/upload batch
+
+        Returns:
+            List of indexing results for each file
+        """
+        files = [Path(file_path) for file_path in _iter_supported_files(directory_path)]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        loop = asyncio.get_running_loop()
+
+        # Phase 1: load and split all files in a process pool (PDF parsing
+        # and recursive splitting are CPU-bound pure Python)
+        async def load_one(file_path: Path, pool: ProcessPoolExecutor):
+            async with semaphore:
                 try:
-                    result = self.index_file(str(file_path), collection_name, topic, metadata)
-                    results.append(result)
+                    chunks = await loop.run_in_executor(
+                        pool, _load_and_split, str(file_path), self.chunk_size, self.chunk_overlap
+                    )
+
+                    file_metadata = {
+                        "source_file": file_path.name,
+                        "file_path": str(file_path),
+                        "topic": topic,
+                        **(metadata or {})
+                    }
+                    for chunk in chunks:
+                        chunk.metadata.update(file_metadata)
+
+                    return file_path, chunks, None
                 except Exception as e:
-                    results.append({
-                        "file": file_path.name,
-                        "status": "error",
-                        "error": str(e)
-                    })
-        
+                    return file_path, None, e
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            loaded = await asyncio.gather(*[load_one(file_path, pool) for file_path in files])
+
+        results = []
+        all_chunks = []
+        for file_path, chunks, error in loaded:
+            if error is not None:
+                results.append({
+                    "file": file_path.name,
+                    "status": "error",
+                    "error": str(error)
+                })
+                continue
+
+            all_chunks.extend(chunks)
+            results.append({
+                "file": file_path.name,
+                "num_chunks": len(chunks),
+                "collection": collection_name,
+                "topic": topic,
+                "status": "success"
+            })
+
+        if not all_chunks:
+            return results
+
+        # Skip chunks whose content is already in the collection
+        all_chunks, point_ids = await asyncio.to_thread(
+            self._dedupe_chunks, all_chunks, collection_name
+        )
+        if not all_chunks:
+            return results
+
+        # Phase 2: embed all chunks across files in fixed-size batches
+        texts = [chunk.page_content for chunk in all_chunks]
+        batches = [
+            texts[start:start + embed_batch_size]
+            for start in range(0, len(texts), embed_batch_size)
+        ]
+
+        async def embed_batch(batch: List[str]) -> List[List[float]]:
+            async with semaphore:
+                if self._fastembed is not None:
+                    return await asyncio.to_thread(self._embed_texts, batch)
+                return await self.embeddings.aembed_documents(batch)
+
+        embedded = await asyncio.gather(*[embed_batch(batch) for batch in batches])
+        vectors = [vector for batch_vectors in embedded for vector in batch_vectors]
+
+        self._ensure_collection(collection_name, len(vectors[0]))
+
+        # Phase 3: bulk upload in batches
+        points = [
+            PointStruct(
+                id=point_id,
+                vector=vector,
+                payload={"page_content": chunk.page_content, "metadata": chunk.metadata}
+            )
+            for chunk, vector, point_id in zip(all_chunks, vectors, point_ids)
+        ]
+
+        aclient = AsyncQdrantClient(url=self.qdrant_url, prefer_grpc=True, grpc_port=6334)
+
+        async def upload_batch(batch: List[PointStruct]) -> None:
+            async with semaphore:
+                await aclient.upsert(collection_name=collection_name, points=batch, wait=False)
+
+        try:
+            await asyncio.gather(*[
+                upload_batch(points[start:start + embed_batch_size])
+                for start in range(0, len(points), embed_batch_size)
+            ])
+        finally:
+            await aclient.close()
+
         return results
     
     def delete_collection(self, collection_name: str) -> None:
@@ -191,6 +671,7 @@ class DocumentIndexer:
             collection_name: Name of the collection to delete
         """
         self.qdrant_client.delete_collection(collection_name)
+        self._known_collections.discard(collection_name)
     
     def list_collections(self) -> List[str]:
         """
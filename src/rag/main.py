@@ -1,12 +1,11 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
+from fastapi import BackgroundTasks, FastAPI, UploadFile, File, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 import os
-import tempfile
-import shutil
+import uuid
 from pydantic import BaseModel
 from indexing import DocumentIndexer
 from retrieval import DocumentRetriever, ChatGenerator
@@ -38,6 +37,7 @@ A Retrieval-Augmented Generation (RAG) system for indexing and querying learning
 - **Framework**: FastAPI + LangChain
 """,
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Learning RAG",
         "url": "http://localhost:8000",
@@ -92,6 +92,42 @@ chat_generator = ChatGenerator(
 # Default collection name
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "learning_materials")
 
+# In-memory store for background indexing jobs (single-process deployment).
+# Finished jobs are pruned once the store grows past this many entries.
+MAX_FINISHED_JOBS = 256
+indexing_jobs = {}
+
+
+def _prune_finished_jobs():
+    """Drop the oldest finished jobs once the store grows too large"""
+    if len(indexing_jobs) <= MAX_FINISHED_JOBS:
+        return
+    finished = [
+        job_id for job_id, job in indexing_jobs.items()
+        if job["status"] in ("completed", "failed")
+    ]
+    for job_id in finished[:len(indexing_jobs) - MAX_FINISHED_JOBS]:
+        indexing_jobs.pop(job_id, None)
+
+
+def _run_index_job(job_id: str, data: bytes, filename: str, collection_name: str, topic: str, metadata: dict):
+    """Background task: index one uploaded document and record the outcome"""
+    job = indexing_jobs[job_id]
+    job["status"] = "running"
+    try:
+        job["result"] = indexer.index_bytes(
+            data=data,
+            filename=filename,
+            collection_name=collection_name,
+            topic=topic,
+            metadata=metadata
+        )
+        job["status"] = "completed"
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = str(e)
+
+
 # Request/Response models
 class SearchRequest(BaseModel):
     query: str
@@ -136,29 +172,31 @@ async def health():
 
 @app.post("/index/upload", tags=["indexing"])
 async def index_document(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(..., description="PDF, TXT, or Markdown file to index"),
     topic: str = Form(..., description="Topic/category for this document"),
     collection_name: str = Form(default=COLLECTION_NAME, description="Collection name (optional)")
 ):
     """
-    Upload and index a document into the vector database
-    
-    This endpoint accepts document files and indexes them for semantic search.
+    Upload a document and index it in the background
+
+    This endpoint accepts document files and queues them for indexing.
     Documents are split into chunks and embedded using Ollama's nomic-embed-text model.
-    
+    The response returns immediately with a job ID; poll `/jobs/{job_id}` for progress.
+
     **Supported File Types:**
     - PDF (.pdf)
     - Text (.txt, .text)
     - Markdown (.md, .markdown)
-    
+
     **Parameters:**
     - **file**: The document file to upload and index
     - **topic**: Topic/category for organizing this document (required)
     - **collection_name**: Vector database collection name (optional, defaults to 'learning_materials')
-    
+
     **Returns:**
-    - Success message with indexing statistics (number of chunks created, topic, etc.)
-    
+    - Job ID and status URL for tracking the indexing job
+
     **Example Usage:**
     ```bash
     curl -X POST "http://localhost:8000/index/upload" \\
@@ -176,40 +214,58 @@ async def index_document(
             detail=f"Unsupported file type: {file_extension}. Supported types: {', '.join(supported_extensions)}"
         )
     
-    # Save uploaded file to temporary location
-    temp_dir = tempfile.mkdtemp()
-    temp_file_path = Path(temp_dir) / file.filename
-    
-    try:
-        # Write uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        # Index the document
-        result = indexer.index_file(
-            file_path=str(temp_file_path),
-            collection_name=collection_name,
-            topic=topic,
-            metadata={
-                "uploaded_at": datetime.utcnow().isoformat(),
-                "original_filename": file.filename
-            }
-        )
-        
-        return {
-            "message": "Document indexed successfully",
-            "result": result
+    # Read the body up front (the UploadFile is closed once the request
+    # finishes), then hand the heavy work to a background task so the
+    # worker is free for the next upload
+    data = await file.read()
+
+    job_id = str(uuid.uuid4())
+    indexing_jobs[job_id] = {
+        "job_id": job_id,
+        "status": "queued",
+        "file": file.filename,
+        "topic": topic,
+        "collection": collection_name,
+        "created_at": datetime.utcnow().isoformat()
+    }
+    _prune_finished_jobs()
+
+    background_tasks.add_task(
+        _run_index_job,
+        job_id,
+        data,
+        file.filename,
+        collection_name,
+        topic,
+        {
+            "uploaded_at": datetime.utcnow().isoformat(),
+            "original_filename": file.filename
         }
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error indexing document: {str(e)}")
-    
-    finally:
-        # Clean up temporary file
-        if temp_file_path.exists():
-            temp_file_path.unlink()
-        if Path(temp_dir).exists():
-            shutil.rmtree(temp_dir)
+    )
+
+    return {
+        "message": "Document accepted for indexing",
+        "job_id": job_id,
+        "status_url": f"/jobs/{job_id}"
+    }
+
+
+@app.get("/jobs/{job_id}", tags=["indexing"])
+async def get_job(job_id: str):
+    """
+    Get the status of a background indexing job
+
+    **Parameters:**
+    - **job_id**: Job ID returned by `/index/upload`
+
+    **Returns:**
+    - Job status (`queued`, `running`, `completed` or `failed`) plus the
+      indexing result or error once the job has finished
+    """
+    job = indexing_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return job
 
 @app.get("/collections", tags=["topics"])
 async def list_collections():
@@ -464,7 +520,7 @@ async def search_documents(request: SearchRequest, collection_name: str = COLLEC
     ```
     """
     try:
-        chunks = retriever.search_documents(
+        chunks = await retriever.asearch_documents(
             query=request.query,
             collection_name=collection_name,
             topics=request.topics,
@@ -510,7 +566,7 @@ async def chat(request: ChatRequest, collection_name: str = COLLECTION_NAME):
     """
     try:
         # Retrieve relevant chunks
-        chunks = retriever.search_documents(
+        chunks = await retriever.asearch_documents(
             query=request.question,
             collection_name=collection_name,
             topics=request.topics,
@@ -527,15 +583,16 @@ async def chat(request: ChatRequest, collection_name: str = COLLECTION_NAME):
         
         # Generate response
         if request.stream:
-            # Return streaming response
-            def generate():
-                for chunk in chat_generator.generate_response_stream(request.question, chunks):
-                    yield chunk
-            
-            return StreamingResponse(generate(), media_type="text/plain")
+            # Stream tokens straight from the async generator, pre-encoded
+            # so the response path doesn't re-encode every token
+            return StreamingResponse(
+                (token.encode("utf-8") async for token in
+                 chat_generator.agenerate_response_stream(request.question, chunks)),
+                media_type="text/plain"
+            )
         else:
             # Return complete response
-            answer = chat_generator.generate_response(request.question, chunks)
+            answer = await chat_generator.agenerate_response(request.question, chunks)
             
             return {
                 "question": request.question,
@@ -548,4 +605,4 @@ async def chat(request: ChatRequest, collection_name: str = COLLECTION_NAME):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools")
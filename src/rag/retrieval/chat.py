@@ -13,13 +13,16 @@ LLM providers through LangChain's unified API. Easily switch between:
 Configuration is done via environment variables or direct instantiation.
 """
 
+import hashlib
 import os
-from typing import List, Dict, Any, Generator, Optional
+from cachetools import TTLCache
+from collections import OrderedDict
+from typing import List, Dict, Any, AsyncGenerator, Generator, Optional
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import RunnableLambda
 
 
 class ChatGenerator:
@@ -28,7 +31,12 @@ class ChatGenerator:
     
     Supports multiple LLM providers through LangChain's unified interface.
     Default provider is Ollama for local deployment.
-    
+
+    Connection handling: the underlying Ollama client keeps one pooled
+    HTTP session per ChatGenerator instance, so construct the generator
+    once at startup and reuse it — instantiating it per request would pay
+    a fresh TCP handshake on every generate call.
+
     Attributes:
         llm: The LangChain LLM instance
         system_prompt: Default system prompt for the assistant
@@ -43,7 +51,13 @@ class ChatGenerator:
         >>> llm = ChatOpenAI(model="gpt-4")
         >>> chat = ChatGenerator(llm=llm)
     """
-    
+
+    # Returned without calling the LLM when retrieval came back empty
+    NO_CONTEXT_MESSAGE = (
+        "Ich habe zu dieser Frage im Lernmaterial nichts gefunden. "
+        "Bitte formulieren Sie die Frage um oder fügen Sie mehr Material hinzu."
+    )
+
     def __init__(
         self,
         ollama_url: str = None,
@@ -53,11 +67,13 @@ class ChatGenerator:
         temperature: float = 0.7,
         top_p: float = 0.9,
         top_k: int = 40,
-        timeout: int = 300
+        timeout: int = 300,
+        keep_alive: str = "30m",
+        context_token_budget: int = 3000
     ):
         """
         Initialize the chat generator.
-        
+
         Args:
             ollama_url: URL for Ollama service (only used if llm not provided)
             model: Model name (only used if llm not provided)
@@ -68,7 +84,12 @@ class ChatGenerator:
             top_p: Nucleus sampling parameter
             top_k: Top-k sampling parameter
             timeout: Request timeout in seconds
-            
+            keep_alive: How long Ollama keeps the model loaded between
+                requests (avoids reloading the model and recomputing the
+                shared prompt prefix on every chat turn)
+            context_token_budget: Approximate token budget for retrieved
+                context; lowest-scoring chunks are dropped once exceeded
+
         Raises:
             ValueError: If neither llm nor model is provided
         """
@@ -77,6 +98,8 @@ class ChatGenerator:
         self.top_p = top_p
         self.top_k = top_k
         self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.context_token_budget = context_token_budget
         
         # Use provided LLM or create Ollama instance
         if llm is not None:
@@ -93,13 +116,23 @@ class ChatGenerator:
                 temperature=temperature,
                 top_p=top_p,
                 top_k=top_k,
-                timeout=timeout
+                timeout=timeout,
+                keep_alive=keep_alive
             )
             self.provider = "ollama"
         
         # Set system prompt
         self.system_prompt = system_prompt or self._get_default_system_prompt()
-        
+
+        # Small LRU for formatted context: follow-up questions over the
+        # same retrieved chunks skip re-joining the context text
+        self._fmt_cache = OrderedDict()
+        self._fmt_cache_size = 8
+
+        # Answer cache: the same question over the same retrieved chunks
+        # (classroom-style repeats) skips inference entirely for an hour
+        self._answer_cache = TTLCache(maxsize=1024, ttl=3600)
+
         # Build the LangChain processing chain
         self._build_chain()
     
@@ -142,17 +175,78 @@ Richtlinien:
             ("human", "{question}")
         ])
         
-        # Build chain: prompt -> llm -> output parser
+        # Build chain: input mapping -> prompt -> llm -> output parser.
+        # One RunnableLambda builds the whole input dict instead of a
+        # parallel runnable invoking a lambda per key.
         self.chain = (
-            {
-                "context": lambda x: self._format_context(x["context_chunks"]),
-                "question": lambda x: x["question"]
-            }
+            RunnableLambda(lambda x: {
+                "context": self._format_context(x["context_chunks"]),
+                "question": x["question"]
+            })
             | prompt
             | self.llm
             | StrOutputParser()
         )
     
+    def _answer_cache_key(self, question: str, context_chunks: List[Dict[str, Any]]) -> bytes:
+        """
+        Build a stable cache key from the question and chunk identity
+
+        The question is whitespace-normalized and lowercased; the chunks
+        contribute a digest of their contents in sorted order, so the same
+        retrieval in any order maps to the same key while different chunk
+        sets from the same files never collide.
+
+        Args:
+            question: The user's question
+            context_chunks: List of retrieved document chunks
+
+        Returns:
+            16-byte digest key
+        """
+        normalized = " ".join(question.split()).lower()
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16)
+        for content in sorted(chunk.get("content", "") for chunk in context_chunks):
+            digest.update(b"\x1f")
+            digest.update(content.encode("utf-8"))
+        return digest.digest()
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token for these models)"""
+        return len(text) // 4 + 1
+
+    def _pack_context(self, context_chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Cap retrieved context to the configured token budget.
+
+        Prefill time grows superlinearly with prompt length, so chunks are
+        kept in descending score order until the budget is exhausted,
+        bounding worst-case time-to-first-token. Chunk order is preserved
+        for the survivors.
+
+        Args:
+            context_chunks: List of retrieved document chunks with scores
+
+        Returns:
+            The chunks that fit the budget (always at least one)
+        """
+        kept = []
+        total = 0
+        for chunk in sorted(context_chunks, key=lambda c: c.get("score", 0.0), reverse=True):
+            tokens = self._estimate_tokens(chunk.get("content", ""))
+            if kept and total + tokens > self.context_token_budget:
+                break
+            kept.append(chunk)
+            total += tokens
+
+        if len(kept) == len(context_chunks):
+            # Return the original list so the format cache keeps working
+            return context_chunks
+
+        kept_ids = {id(chunk) for chunk in kept}
+        return [chunk for chunk in context_chunks if id(chunk) in kept_ids]
+
     def _format_context(self, context_chunks: List[Dict[str, Any]]) -> str:
         """
         Format context chunks into a single text block.
@@ -165,16 +259,38 @@ Richtlinien:
         """
         if not context_chunks:
             return "Kein relevanter Kontext gefunden."
-        
+
+        # Reuse the formatted string when the same chunks come back
+        # (follow-up questions over identical retrieval). Keyed by a digest
+        # of the contents — an id()-keyed entry would go stale as soon as
+        # the original list is freed and its address reused.
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in context_chunks:
+            digest.update(chunk.get("content", "").encode("utf-8"))
+            digest.update(b"\x1f")
+            digest.update(chunk.get("metadata", {}).get("source_file", "").encode("utf-8"))
+            digest.update(b"\x1e")
+        cache_key = digest.digest()
+        cached = self._fmt_cache.get(cache_key)
+        if cached is not None:
+            self._fmt_cache.move_to_end(cache_key)
+            return cached
+
         formatted_chunks = []
         for chunk in context_chunks:
             metadata = chunk.get("metadata", {})
             content = chunk.get("content", "")
             source = metadata.get("source_file", "Unbekannte Quelle")
-            
+
             formatted_chunks.append(f"[Quelle: {source}]\n{content}")
-        
-        return "\n\n".join(formatted_chunks)
+
+        formatted = "\n\n".join(formatted_chunks)
+
+        self._fmt_cache[cache_key] = formatted
+        while len(self._fmt_cache) > self._fmt_cache_size:
+            self._fmt_cache.popitem(last=False)
+
+        return formatted
     
     def generate_response(
         self,
@@ -200,13 +316,28 @@ Richtlinien:
             >>> chunks = [{"content": "...", "metadata": {"source_file": "doc.pdf"}}]
             >>> response = chat_gen.generate_response("What is RAG?", chunks)
         """
+        # Without context the model could only hallucinate — skip the
+        # inference call entirely
+        if not context_chunks:
+            return self.NO_CONTEXT_MESSAGE
+
+        # Serve repeats of the same question over the same chunks from cache
+        cache_key = self._answer_cache_key(question, context_chunks)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
+            # Cap context to the token budget before building the prompt
+            context_chunks = self._pack_context(context_chunks)
+
             # Invoke the chain
             response = self.chain.invoke({
                 "question": question,
                 "context_chunks": context_chunks
             })
-            
+
+            self._answer_cache[cache_key] = response
             return response
             
         except TimeoutError:
@@ -224,6 +355,117 @@ Richtlinien:
             print(f"Error generating response: {e}")
             return error_msg
     
+    async def agenerate_response(
+        self,
+        question: str,
+        context_chunks: List[Dict[str, Any]]
+    ) -> str:
+        """
+        Generate a response asynchronously.
+
+        Async counterpart of generate_response using the chain's ainvoke,
+        so concurrent chat requests share the event loop instead of
+        serializing behind one blocking Ollama call.
+
+        Args:
+            question: The user's question
+            context_chunks: List of relevant document chunks with metadata
+
+        Returns:
+            Generated response text
+        """
+        if not context_chunks:
+            return self.NO_CONTEXT_MESSAGE
+
+        cache_key = self._answer_cache_key(question, context_chunks)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            context_chunks = self._pack_context(context_chunks)
+
+            response = await self.chain.ainvoke({
+                "question": question,
+                "context_chunks": context_chunks
+            })
+
+            self._answer_cache[cache_key] = response
+            return response
+
+        except TimeoutError:
+            error_msg = f"Die Anfrage hat zu lange gedauert (>{self.timeout}s). Bitte versuchen Sie es mit einer kürzeren Frage."
+            print(f"LLM timeout after {self.timeout} seconds")
+            return error_msg
+
+        except ConnectionError as e:
+            error_msg = "Verbindung zum LLM-Service fehlgeschlagen. Bitte stellen Sie sicher, dass der Service läuft."
+            print(f"Cannot connect to LLM service: {e}")
+            return error_msg
+
+        except Exception as e:
+            error_msg = f"Ein Fehler ist aufgetreten: {str(e)}"
+            print(f"Error generating response: {e}")
+            return error_msg
+
+    async def agenerate_response_stream(
+        self,
+        question: str,
+        context_chunks: List[Dict[str, Any]]
+    ) -> AsyncGenerator[str, None]:
+        """
+        Generate a streaming response asynchronously.
+
+        Async counterpart of generate_response_stream using the chain's
+        astream method.
+
+        Args:
+            question: The user's question
+            context_chunks: List of relevant document chunks
+
+        Yields:
+            Response tokens as they're generated
+        """
+        if not context_chunks:
+            yield self.NO_CONTEXT_MESSAGE
+            return
+
+        # Replay cached answers in slices to preserve the streaming UX
+        cache_key = self._answer_cache_key(question, context_chunks)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            for start in range(0, len(cached), 64):
+                yield cached[start:start + 64]
+            return
+
+        parts = []
+        try:
+            context_chunks = self._pack_context(context_chunks)
+
+            async for chunk in self.chain.astream({
+                "question": question,
+                "context_chunks": context_chunks
+            }):
+                parts.append(chunk)
+                yield chunk
+
+            self._answer_cache[cache_key] = "".join(parts)
+
+        except TimeoutError:
+            error_msg = f"Die Anfrage hat zu lange gedauert (>{self.timeout}s)."
+            print(f"LLM streaming timeout after {self.timeout} seconds")
+            yield error_msg
+
+        except ConnectionError as e:
+            error_msg = "Verbindung zum LLM-Service fehlgeschlagen."
+            print(f"Cannot connect to LLM for streaming: {e}")
+            yield error_msg
+
+        except Exception as e:
+            error_msg = f"Ein Fehler ist aufgetreten: {str(e)}"
+            print(f"Error generating streaming response: {e}")
+            yield error_msg
+
     def generate_response_stream(
         self,
         question: str,
@@ -245,13 +487,34 @@ Richtlinien:
             >>> for token in chat_gen.generate_response_stream("Explain RAG", chunks):
             ...     print(token, end="", flush=True)
         """
+        # Without context the model could only hallucinate — skip the
+        # inference call entirely
+        if not context_chunks:
+            yield self.NO_CONTEXT_MESSAGE
+            return
+
+        # Replay cached answers in slices to preserve the streaming UX
+        cache_key = self._answer_cache_key(question, context_chunks)
+        cached = self._answer_cache.get(cache_key)
+        if cached is not None:
+            for start in range(0, len(cached), 64):
+                yield cached[start:start + 64]
+            return
+
+        parts = []
         try:
+            # Cap context to the token budget before building the prompt
+            context_chunks = self._pack_context(context_chunks)
+
             # Stream the chain
             for chunk in self.chain.stream({
                 "question": question,
                 "context_chunks": context_chunks
             }):
+                parts.append(chunk)
                 yield chunk
+
+            self._answer_cache[cache_key] = "".join(parts)
                 
         except TimeoutError:
             error_msg = f"Die Anfrage hat zu lange gedauert (>{self.timeout}s)."
@@ -2,9 +2,15 @@
 Query and retrieval operations for the RAG system
 """
 
+import asyncio
+import time
+from collections import OrderedDict
 from typing import List, Optional
+import httpx
+import numpy as np
+import orjson
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchAny
+from qdrant_client.models import Filter, FieldCondition, FilterSelector, MatchAny, MatchValue
 from langchain_community.embeddings import OllamaEmbeddings
 
 
@@ -15,19 +21,29 @@ class DocumentRetriever:
         self, 
         qdrant_url: str = "http://localhost:6333",
         ollama_url: str = "http://localhost:11434",
-        embedding_model: str = "nomic-embed-text"
+        embedding_model: str = "nomic-embed-text",
+        use_local_embeddings: bool = False,
+        local_embedding_model: str = "nomic-ai/nomic-embed-text-v1.5"
     ):
         """
         Initialize the document retriever
-        
+
         Args:
             qdrant_url: URL for Qdrant vector database
             ollama_url: URL for Ollama service
             embedding_model: Name of the embedding model
+            use_local_embeddings: Embed queries in-process with ONNX Runtime
+                instead of over HTTP to Ollama (requires the optional
+                optimum/transformers packages). Opt-in because query vectors
+                must come from the same model the documents were indexed with.
+            local_embedding_model: Hugging Face model name for the local path
         """
         self.qdrant_url = qdrant_url
         self.ollama_url = ollama_url
-        self.qdrant_client = QdrantClient(url=qdrant_url)
+        self.embedding_model = embedding_model
+        # gRPC ships query vectors as raw protobuf floats instead of JSON
+        # lists, trimming encode/decode work on every search
+        self.qdrant_client = QdrantClient(url=qdrant_url, prefer_grpc=True, grpc_port=6334)
         
         # Initialize embeddings
         self.embeddings = OllamaEmbeddings(
@@ -35,7 +51,233 @@ class DocumentRetriever:
             model=embedding_model,
             model_kwargs={}  # Use only default supported parameters
         )
-    
+
+        # Cache query embeddings so repeated or refined questions skip the
+        # embedding round trip entirely (shared by the sync and async paths)
+        self._query_vector_cache = OrderedDict()
+        self._query_vector_cache_size = 1024
+
+        # Shared async HTTP client for Ollama, created lazily so it binds to
+        # the running event loop
+        self._ollama_aclient = None
+
+        # Micro-batching queue for concurrent query embeddings (lazy, like
+        # the client, so it binds to the running loop)
+        self._embed_queue = None
+        self._embed_worker_task = None
+        self._embed_batch_size = 16
+        self._embed_batch_window = 0.005  # seconds to wait for co-arrivals
+
+        # Topic aggregation cache per collection, validated against the
+        # collection's point count so it survives only until data changes
+        self._topics_cache = {}
+
+        # Short-TTL cache of collection names for existence checks
+        self._col_cache = (0.0, frozenset())
+
+        # Optional in-process query embedding (no HTTP round trip)
+        self._ort_model = None
+        self._ort_tokenizer = None
+        if use_local_embeddings:
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+            self._ort_tokenizer = AutoTokenizer.from_pretrained(local_embedding_model)
+            self._ort_model = ORTModelForFeatureExtraction.from_pretrained(
+                local_embedding_model, provider="CPUExecutionProvider"
+            )
+
+    def _collection_exists(self, collection_name: str) -> bool:
+        """
+        Check whether a collection exists, with a short-TTL name cache
+
+        The UI polls the topic endpoints every few seconds; caching the
+        collection list for a few seconds removes one Qdrant round trip
+        per poll. A just-created collection may be invisible for up to the
+        TTL, which only delays its first appearance in the sidebar.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            True if the collection exists
+        """
+        now = time.monotonic()
+        cached_at, names = self._col_cache
+        if now - cached_at > 5.0:
+            names = frozenset(col.name for col in self.qdrant_client.get_collections().collections)
+            self._col_cache = (now, names)
+        return collection_name in names
+
+    def _embed_query_local(self, query: str) -> List[float]:
+        """
+        Embed a query in-process with the ONNX model
+
+        Args:
+            query: The search query (whitespace-normalized)
+
+        Returns:
+            Normalized embedding vector for the query
+        """
+        inputs = self._ort_tokenizer(query, return_tensors="np", truncation=True, max_length=512)
+        output = self._ort_model(**inputs)
+
+        # Mean-pool over the attention mask: nomic-embed-text is a
+        # mean-pooling model, and both the Ollama and fastembed indexing
+        # paths mean-pool, so the query vectors must too or they land in a
+        # different space than the indexed documents. No task prefix is
+        # added for the same reason — the indexing paths embed raw text.
+        hidden = output.last_hidden_state
+        mask = inputs["attention_mask"][..., None].astype(hidden.dtype)
+        vector = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        vector = vector / np.linalg.norm(vector, axis=1, keepdims=True)
+        return vector[0].tolist()
+
+    def _iter_points(self, collection_name: str, scroll_filter=None, batch: int = 1024, with_payload: bool = True):
+        """
+        Yield every matching point in a collection, paginating the scroll
+
+        Follows the next-page offset until exhaustion, so callers see all
+        points instead of silently stopping at a single scroll request's
+        limit, and memory stays bounded by the batch size.
+
+        Args:
+            collection_name: Name of the collection
+            scroll_filter: Optional filter applied server-side
+            batch: Page size per scroll request
+            with_payload: Whether to fetch point payloads
+
+        Yields:
+            Qdrant points
+        """
+        offset = None
+        while True:
+            points, offset = self.qdrant_client.scroll(
+                collection_name=collection_name,
+                scroll_filter=scroll_filter,
+                offset=offset,
+                limit=batch,
+                with_payload=with_payload,
+                with_vectors=False
+            )
+            yield from points
+            if offset is None:
+                break
+
+    def _cached_query_vector(self, query: str) -> Optional[List[float]]:
+        """Return the cached embedding for a normalized query, if any"""
+        vector = self._query_vector_cache.get(query)
+        if vector is not None:
+            self._query_vector_cache.move_to_end(query)
+        return vector
+
+    def _store_query_vector(self, query: str, vector: List[float]) -> None:
+        """Cache the embedding for a normalized query with LRU eviction"""
+        self._query_vector_cache[query] = vector
+        self._query_vector_cache.move_to_end(query)
+        while len(self._query_vector_cache) > self._query_vector_cache_size:
+            self._query_vector_cache.popitem(last=False)
+
+    def _embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, consulting the cache first
+
+        Args:
+            query: The search query (whitespace-normalized)
+
+        Returns:
+            Embedding vector for the query
+        """
+        vector = self._cached_query_vector(query)
+        if vector is None:
+            if self._ort_model is not None:
+                vector = self._embed_query_local(query)
+            else:
+                vector = self.embeddings.embed_query(query)
+            self._store_query_vector(query, vector)
+        return vector
+
+    def _get_ollama_aclient(self) -> httpx.AsyncClient:
+        """Lazily create the shared keep-alive async client for Ollama"""
+        if self._ollama_aclient is None:
+            self._ollama_aclient = httpx.AsyncClient(
+                base_url=self.ollama_url,
+                limits=httpx.Limits(max_keepalive_connections=32),
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
+        return self._ollama_aclient
+
+    async def _embed_worker(self) -> None:
+        """
+        Coalesce queued embed requests into batched Ollama calls
+
+        Waits a few milliseconds after the first request for co-arriving
+        queries, then embeds the whole batch in one /api/embed call and
+        resolves each caller's future. Under bursty load N concurrent
+        queries cost roughly one batched round trip instead of N.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._embed_queue.get()]
+            deadline = loop.time() + self._embed_batch_window
+            while len(items) < self._embed_batch_size:
+                try:
+                    items.append(self._embed_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    if loop.time() >= deadline:
+                        break
+                    await asyncio.sleep(0.0005)
+
+            try:
+                response = await self._get_ollama_aclient().post(
+                    "/api/embed",
+                    json={"model": self.embedding_model, "input": [query for query, _ in items]}
+                )
+                response.raise_for_status()
+                vectors = orjson.loads(response.content)["embeddings"]
+                for (query, future), vector in zip(items, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+
+    async def _enqueue_embed(self, query: str) -> List[float]:
+        """Queue a query for batched embedding and await its vector"""
+        if self._embed_queue is None:
+            self._embed_queue = asyncio.Queue()
+            self._embed_worker_task = asyncio.create_task(self._embed_worker())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._embed_queue.put((query, future))
+        return await future
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query asynchronously
+
+        Requests are funneled through a micro-batching queue against
+        Ollama's batch embed endpoint over the pooled httpx client, so
+        embed calls neither block the event loop nor go out one-by-one
+        under concurrent load. Shares the query-vector cache with the
+        sync path.
+
+        Args:
+            query: The search query (whitespace-normalized)
+
+        Returns:
+            Embedding vector for the query
+        """
+        vector = self._cached_query_vector(query)
+        if vector is None:
+            if self._ort_model is not None:
+                vector = await asyncio.to_thread(self._embed_query_local, query)
+            else:
+                vector = await self._enqueue_embed(query)
+            self._store_query_vector(query, vector)
+        return vector
+
     def get_topics(self, collection_name: str) -> List[dict]:
         """
         Get all unique topics from a collection
@@ -47,65 +289,135 @@ class DocumentRetriever:
             List of topics with metadata (name, document_count, chunk_count)
         """
         try:
-            # Check if collection exists
-            collections = self.qdrant_client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            
-            if collection_name not in collection_names:
+            if not self._collection_exists(collection_name):
                 return []
-            
-            # Scroll through all points to get topics
-            scroll_result = self.qdrant_client.scroll(
-                collection_name=collection_name,
-                limit=10000,
-                with_payload=True,
-                with_vectors=False
-            )
-            
-            # Extract unique topics
-            topics_dict = {}
-            for point in scroll_result[0]:
-                # Check for topic in metadata (newer format) or directly in payload (legacy)
-                topic = None
-                source_file = None
-                
-                if point.payload:
-                    if 'metadata' in point.payload:
-                        topic = point.payload['metadata'].get('topic')
-                        source_file = point.payload['metadata'].get('source_file')
-                    elif 'topic' in point.payload:
-                        topic = point.payload['topic']
-                        source_file = point.payload.get('source_file')
-                
-                if topic:
-                    if topic not in topics_dict:
-                        topics_dict[topic] = {
-                            'name': topic,
-                            'document_count': 0,
-                            'chunk_count': 0
-                        }
-                    topics_dict[topic]['chunk_count'] += 1
-                    
-                    # Count unique source files
-                    if source_file:
-                        if 'files' not in topics_dict[topic]:
-                            topics_dict[topic]['files'] = set()
-                        topics_dict[topic]['files'].add(source_file)
-            
-            # Convert to list and calculate document counts
-            topics_list = []
-            for topic_data in topics_dict.values():
-                if 'files' in topic_data:
-                    topic_data['document_count'] = len(topic_data['files'])
-                    del topic_data['files']  # Remove the set from response
-                topics_list.append(topic_data)
-            
-            return sorted(topics_list, key=lambda x: x['name'])
-            
+
+            # Reuse the last aggregation while the collection is unchanged
+            # (UIs poll this endpoint every few seconds)
+            points_count = self.qdrant_client.get_collection(collection_name).points_count
+            cached = self._topics_cache.get(collection_name)
+            if cached is not None and cached[0] == points_count:
+                return cached[1]
+
+            try:
+                # Aggregate server-side: one facet call per dimension, no
+                # payloads shipped over the wire and no 10k scroll cap
+                topics = self._get_topics_facet(collection_name)
+            except Exception:
+                # Faceting needs Qdrant >= 1.11 and indexed payload fields;
+                # older deployments fall back to scrolling the collection
+                topics = self._get_topics_scroll(collection_name)
+
+            self._topics_cache[collection_name] = (points_count, topics)
+            return topics
+
         except Exception as e:
             print(f"Error getting topics: {e}")
             return []
-    
+
+    def _get_topics_facet(self, collection_name: str) -> List[dict]:
+        """
+        Aggregate topics with Qdrant's facet API
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            List of topics with metadata (name, document_count, chunk_count)
+        """
+        topic_hits = self.qdrant_client.facet(
+            collection_name=collection_name,
+            key="metadata.topic",
+            limit=1000
+        ).hits
+
+        topics_list = []
+        for hit in topic_hits:
+            file_hits = self.qdrant_client.facet(
+                collection_name=collection_name,
+                key="metadata.source_file",
+                facet_filter=Filter(
+                    must=[
+                        FieldCondition(
+                            key="metadata.topic",
+                            match=MatchValue(value=hit.value)
+                        )
+                    ]
+                ),
+                limit=100000
+            ).hits
+
+            topics_list.append({
+                'name': hit.value,
+                'document_count': len(file_hits),
+                'chunk_count': hit.count
+            })
+
+        return sorted(topics_list, key=lambda x: x['name'])
+
+    def _get_topics_scroll(self, collection_name: str) -> List[dict]:
+        """
+        Aggregate topics by scrolling the collection (fallback path)
+
+        The group-by runs vectorized in numpy instead of a per-point Python
+        dict loop, which matters once collections reach tens of thousands
+        of chunks.
+
+        Args:
+            collection_name: Name of the collection
+
+        Returns:
+            List of topics with metadata (name, document_count, chunk_count)
+        """
+        # Collect (topic, source_file) pairs, paginating through all points
+        topics = []
+        files = []
+        for point in self._iter_points(collection_name):
+            # Check for topic in metadata (newer format) or directly in payload (legacy)
+            topic = None
+            source_file = None
+
+            if point.payload:
+                if 'metadata' in point.payload:
+                    topic = point.payload['metadata'].get('topic')
+                    source_file = point.payload['metadata'].get('source_file')
+                elif 'topic' in point.payload:
+                    topic = point.payload['topic']
+                    source_file = point.payload.get('source_file')
+
+            if topic:
+                topics.append(topic)
+                files.append(source_file or "")
+
+        if not topics:
+            return []
+
+        topic_arr = np.asarray(topics, dtype=str)
+        file_arr = np.asarray(files, dtype=str)
+
+        # Chunk counts per topic (np.unique returns names sorted)
+        names, chunk_counts = np.unique(topic_arr, return_counts=True)
+
+        # Document counts: unique (topic, file) pairs, ignoring chunks
+        # without a source file. The unit separator joins the pair (numpy's
+        # fixed-width unicode would strip a trailing NUL).
+        has_file = file_arr != ""
+        pairs = np.unique(np.char.add(np.char.add(topic_arr[has_file], "\x1f"), file_arr[has_file]))
+        pair_topics, document_counts = np.unique(
+            np.asarray([pair.split("\x1f", 1)[0] for pair in pairs], dtype=str),
+            return_counts=True
+        )
+        documents_by_topic = dict(zip(pair_topics, document_counts))
+
+        return [
+            {
+                'name': str(name),
+                'document_count': int(documents_by_topic.get(name, 0)),
+                'chunk_count': int(chunk_count)
+            }
+            for name, chunk_count in zip(names, chunk_counts)
+        ]
+
     def get_topic_files(self, topic_name: str, collection_name: str) -> List[dict]:
         """
         Get all unique files for a specific topic
@@ -118,40 +430,36 @@ class DocumentRetriever:
             List of files with metadata (filename, chunk_count, uploaded_at)
         """
         try:
-            # Check if collection exists
-            collections = self.qdrant_client.get_collections()
-            collection_names = [col.name for col in collections.collections]
-            
-            if collection_name not in collection_names:
+            if not self._collection_exists(collection_name):
                 return []
-            
-            # Scroll through all points for this topic
-            scroll_result = self.qdrant_client.scroll(
-                collection_name=collection_name,
-                limit=10000,
-                with_payload=True,
-                with_vectors=False
+
+            # Scroll only this topic's points: the predicate runs server-side
+            # instead of shipping the whole collection and filtering here
+            topic_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key="metadata.topic",
+                        match=MatchValue(value=topic_name)
+                    )
+                ]
             )
-            
+
             # Extract unique files for this topic
             files_dict = {}
-            for point in scroll_result[0]:
+            for point in self._iter_points(collection_name, scroll_filter=topic_filter):
                 if point.payload and 'metadata' in point.payload:
                     metadata = point.payload['metadata']
-                    point_topic = metadata.get('topic')
-                    
-                    if point_topic == topic_name:
-                        source_file = metadata.get('source_file') or metadata.get('original_filename')
-                        uploaded_at = metadata.get('uploaded_at', '')
-                        
-                        if source_file:
-                            if source_file not in files_dict:
-                                files_dict[source_file] = {
-                                    'filename': source_file,
-                                    'chunk_count': 0,
-                                    'uploaded_at': uploaded_at
-                                }
-                            files_dict[source_file]['chunk_count'] += 1
+                    source_file = metadata.get('source_file') or metadata.get('original_filename')
+                    uploaded_at = metadata.get('uploaded_at', '')
+
+                    if source_file:
+                        if source_file not in files_dict:
+                            files_dict[source_file] = {
+                                'filename': source_file,
+                                'chunk_count': 0,
+                                'uploaded_at': uploaded_at
+                            }
+                        files_dict[source_file]['chunk_count'] += 1
             
             # Convert to list and sort by filename
             files_list = list(files_dict.values())
@@ -181,49 +489,103 @@ class DocumentRetriever:
             List of relevant document chunks with metadata
         """
         try:
-            # Generate query embedding
-            query_vector = self.embeddings.embed_query(query)
-            
-            # Build filter for topics if provided
-            query_filter = None
-            if topics and len(topics) > 0:
-                query_filter = Filter(
-                    must=[
-                        FieldCondition(
-                            key="metadata.topic",
-                            match=MatchAny(any=topics)
-                        )
-                    ]
-                )
-            
-            # Search in Qdrant
-            search_results = self.qdrant_client.search(
-                collection_name=collection_name,
-                query_vector=query_vector,
-                query_filter=query_filter,
-                limit=limit,
-                with_payload=True
-            )
-            
-            # Format results
-            chunks = []
-            for result in search_results:
-                chunk = {
-                    'content': result.payload.get('page_content', ''),
-                    'score': result.score,
-                    'metadata': {
-                        'topic': result.payload.get('metadata', {}).get('topic', ''),
-                        'source_file': result.payload.get('metadata', {}).get('source_file', ''),
-                        'page': result.payload.get('metadata', {}).get('page', None)
-                    }
-                }
-                chunks.append(chunk)
-            
-            return chunks
-            
+            # Generate query embedding (whitespace-normalized so trivial
+            # variants of the same query share a cache entry)
+            query_vector = self._embed_query(" ".join(query.split()))
+            return self._run_search(query_vector, collection_name, topics, limit)
+
         except Exception as e:
             print(f"Error searching documents: {e}")
             return []
+
+    async def asearch_documents(
+        self,
+        query: str,
+        collection_name: str,
+        topics: Optional[List[str]] = None,
+        limit: int = 8
+    ) -> List[dict]:
+        """
+        Search for relevant document chunks without blocking the event loop
+
+        Async counterpart of search_documents: the query embedding goes
+        through the pooled async Ollama client.
+
+        Args:
+            query: The search query
+            collection_name: Name of the collection to search
+            topics: Optional list of topics to filter by
+            limit: Maximum number of results to return
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        try:
+            query_vector = await self.aembed_query(" ".join(query.split()))
+            return self._run_search(query_vector, collection_name, topics, limit)
+
+        except Exception as e:
+            print(f"Error searching documents: {e}")
+            return []
+
+    def _run_search(
+        self,
+        query_vector: List[float],
+        collection_name: str,
+        topics: Optional[List[str]],
+        limit: int
+    ) -> List[dict]:
+        """
+        Run the vector search in Qdrant and format the results
+
+        Args:
+            query_vector: Embedding vector for the query
+            collection_name: Name of the collection to search
+            topics: Optional list of topics to filter by
+            limit: Maximum number of results to return
+
+        Returns:
+            List of relevant document chunks with metadata
+        """
+        # Build filter for topics if provided
+        query_filter = None
+        if topics and len(topics) > 0:
+            query_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key="metadata.topic",
+                        match=MatchAny(any=topics)
+                    )
+                ]
+            )
+
+        # Search in Qdrant (query_points is the current query API; .search
+        # is deprecated)
+        search_results = self.qdrant_client.query_points(
+            collection_name=collection_name,
+            query=query_vector,
+            query_filter=query_filter,
+            limit=limit,
+            with_payload=True
+        ).points
+
+        # Format results, binding the payload and metadata dicts once per
+        # result instead of re-fetching them for every field
+        chunks = []
+        for result in search_results:
+            payload = result.payload or {}
+            metadata = payload.get('metadata') or {}
+            chunks.append({
+                'content': payload.get('page_content', ''),
+                'score': result.score,
+                'metadata': {
+                    'topic': metadata.get('topic', ''),
+                    'source_file': metadata.get('source_file', ''),
+                    'page': metadata.get('page')
+                }
+            })
+
+        return chunks
     
     def delete_file_from_topic(
         self, 
@@ -248,19 +610,20 @@ class DocumentRetriever:
                 must=[
                     FieldCondition(
                         key="metadata.topic",
-                        match={"value": topic_name}
+                        match=MatchValue(value=topic_name)
                     ),
                     FieldCondition(
                         key="metadata.source_file",
-                        match={"value": filename}
+                        match=MatchValue(value=filename)
                     )
                 ]
             )
-            
-            # Delete points matching the filter
+
+            # Delete server-side: the filter is evaluated inside Qdrant, no
+            # point IDs round-trip through the client
             result = self.qdrant_client.delete(
                 collection_name=collection_name,
-                points_selector=delete_filter
+                points_selector=FilterSelector(filter=delete_filter)
             )
             
             return {
@@ -293,15 +656,15 @@ class DocumentRetriever:
                 must=[
                     FieldCondition(
                         key="metadata.topic",
-                        match={"value": topic_name}
+                        match=MatchValue(value=topic_name)
                     )
                 ]
             )
             
-            # Delete all points matching the filter
+            # Delete all points matching the filter server-side
             result = self.qdrant_client.delete(
                 collection_name=collection_name,
-                points_selector=delete_filter
+                points_selector=FilterSelector(filter=delete_filter)
             )
             
             return {
@@ -335,51 +698,50 @@ class DocumentRetriever:
             Dict with rename results
         """
         try:
-            # First, get all points with the old topic name
-            scroll_result = self.qdrant_client.scroll(
-                collection_name=collection_name,
-                scroll_filter=Filter(
-                    must=[
-                        FieldCondition(
-                            key="metadata.topic",
-                            match={"value": old_topic_name}
-                        )
-                    ]
-                ),
-                limit=10000,
-                with_payload=True,
-                with_vectors=False
+            topic_filter = Filter(
+                must=[
+                    FieldCondition(
+                        key="metadata.topic",
+                        match=MatchValue(value=old_topic_name)
+                    )
+                ]
             )
-            
-            points = scroll_result[0]
-            
-            if not points:
+
+            # Count matches first so the API can still report how many
+            # chunks were renamed
+            updated_count = self.qdrant_client.count(
+                collection_name=collection_name,
+                count_filter=topic_filter,
+                exact=True
+            ).count
+
+            if updated_count == 0:
                 return {
                     "success": False,
                     "message": f"Topic '{old_topic_name}' not found"
                 }
-            
-            # Update each point's metadata
-            updated_count = 0
-            for point in points:
-                if point.payload and 'metadata' in point.payload:
-                    # Update the topic in metadata
-                    point.payload['metadata']['topic'] = new_topic_name
-                    
-                    # Update the point in Qdrant
-                    self.qdrant_client.set_payload(
-                        collection_name=collection_name,
-                        payload=point.payload,
-                        points=[point.id]
-                    )
-                    updated_count += 1
-            
+
+            # One filter-based payload update: Qdrant patches every matching
+            # point server-side instead of one round trip per chunk. The
+            # key targets the nested metadata object so sibling fields
+            # (source_file, uploaded_at, ...) are preserved.
+            self.qdrant_client.set_payload(
+                collection_name=collection_name,
+                payload={"topic": new_topic_name},
+                points=FilterSelector(filter=topic_filter),
+                key="metadata"
+            )
+
+            # A rename changes topics without changing the point count, so
+            # the count-validated cache must be dropped explicitly
+            self._topics_cache.pop(collection_name, None)
+
             return {
                 "success": True,
                 "message": f"Renamed topic '{old_topic_name}' to '{new_topic_name}' ({updated_count} chunks updated)",
                 "updated_count": updated_count
             }
-            
+
         except Exception as e:
             print(f"Error renaming topic: {e}")
             return {